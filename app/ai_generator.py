@@ -3,10 +3,12 @@ AI 内容生成模块
 使用 OpenAI 兼容 API 生成拟人化的日常聊天邮件内容
 """
 
+import hashlib
 import json
 import logging
+import random
+from collections import OrderedDict
 from dataclasses import dataclass
-from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +41,106 @@ class EmailContent:
 class AIGenerator:
     """AI 邮件内容生成器"""
 
-    def __init__(self, api_key: str, api_base: str, model: str):
-        self.client = OpenAI(
+    # 内容缓存上限：最多缓存的 prompt 数 / 每个 prompt 保留的历史响应数
+    CACHE_MAXSIZE = 128
+    CACHE_RESPONSES_PER_KEY = 8
+
+    def __init__(self, api_key: str, api_base: str, model: str, cache_reuse_prob: float = 0.3):
+        # 延迟导入：openai/httpx 较重，推迟到真正构造生成器时再加载，加快冷启动
+        import httpx
+        from openai import AsyncOpenAI
+
+        # 显式配置连接池并拉长 keepalive，让 TCP/TLS 连接跨 cron 间隔复用，
+        # 避免每次空闲后的首个请求重新握手
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=3600.0),
+            timeout=30.0,
+        )
+        self.client = AsyncOpenAI(
             api_key=api_key,
             base_url=api_base,
+            http_client=self._http_client,
+            # 瞬时 429/5xx 由 SDK 指数退避重试，避免等到下个 cron 周期才补救；
+            # 重试重发同一请求体，system 前缀保持字节级一致，不影响提示缓存
+            max_retries=3,
         )
         self.model = model
+        # 根据 api_base 选择消息构造方式（只判断一次）：
+        # - Anthropic 兼容端点需要在 system 块上显式标记 cache_control 才能命中提示缓存
+        # - OpenAI 端点只要前缀字节级一致即可自动命中前缀缓存
+        if "anthropic" in api_base.lower():
+            self._build_messages = self._build_messages_anthropic
+        else:
+            self._build_messages = self._build_messages_openai
+
+        # 进程内 LRU 内容缓存：key → 近期生成过的 EmailContent 列表（不含主题前缀）
+        # 命中时以 reuse_prob 的概率复用历史响应，跳过整个 API 调用，
+        # 同时保留 temperature>0 的内容多样性
+        self._cache: OrderedDict[str, list[EmailContent]] = OrderedDict()
+        self._reuse_prob = cache_reuse_prob
+
+    @staticmethod
+    def _build_messages_openai(ai_prompt: str) -> list[dict]:
+        """构造 OpenAI 风格消息：静态 system prompt 固定在最前，保证前缀缓存命中"""
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT_TEMPLATE},
+            {"role": "user", "content": ai_prompt},
+        ]
+
+    @staticmethod
+    def _build_messages_anthropic(ai_prompt: str) -> list[dict]:
+        """构造 Anthropic 兼容消息：在 system 文本块上打 cache_control 缓存断点"""
+        return [
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": SYSTEM_PROMPT_TEMPLATE,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+            },
+            {"role": "user", "content": ai_prompt},
+        ]
+
+    def _cache_key(self, ai_prompt: str) -> str:
+        """计算缓存键：模型 + prompt 的摘要"""
+        return hashlib.blake2b(
+            f"{self.model}|{ai_prompt}".encode(), digest_size=16
+        ).hexdigest()
+
+    def _cache_lookup(self, key: str) -> EmailContent | None:
+        """以 reuse_prob 的概率复用一条历史响应，未命中返回 None"""
+        entries = self._cache.get(key)
+        if not entries:
+            return None
+        self._cache.move_to_end(key)
+        if random.random() >= self._reuse_prob:
+            return None
+        return random.choice(entries)
+
+    def _cache_store(self, key: str, content: EmailContent):
+        """记录一条新响应，超限时淘汰最久未使用的键"""
+        entries = self._cache.setdefault(key, [])
+        entries.append(content)
+        if len(entries) > self.CACHE_RESPONSES_PER_KEY:
+            entries.pop(0)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _apply_prefix(content: EmailContent, subject_prefix: str) -> EmailContent:
+        """给缓存中不含前缀的内容加上主题前缀"""
+        if not subject_prefix:
+            return content
+        return EmailContent(
+            subject=f"{subject_prefix}{content.subject}",
+            body=content.body,
+        )
 
-    def generate(self, ai_prompt: str, subject_prefix: str = "") -> EmailContent:
+    async def generate(self, ai_prompt: str, subject_prefix: str = "") -> EmailContent:
         """
         根据给定的 prompt 生成邮件内容
 
@@ -57,51 +151,54 @@ class AIGenerator:
         Returns:
             EmailContent: 包含主题和正文的邮件内容
         """
+        cache_key = self._cache_key(ai_prompt)
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"命中内容缓存，跳过 API 调用 | 主题: {cached.subject}")
+            return self._apply_prefix(cached, subject_prefix)
+
         logger.info(f"正在使用 {self.model} 生成邮件内容...")
 
         try:
-            response = self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT_TEMPLATE},
-                    {"role": "user", "content": ai_prompt},
-                ],
+                messages=self._build_messages(ai_prompt),
                 temperature=0.9,
                 max_tokens=5000,
+                # JSON 模式：由 API 保证返回合法 JSON，无需再清理 markdown 标记
+                response_format={"type": "json_object"},
+                # 流式接收：边到达边累积，首 token 到达即确认请求存活
+                stream=True,
             )
 
-            raw_content = response.choices[0].message.content.strip()
-            logger.debug(f"AI 原始返回: {raw_content}")
-
-            # 解析 JSON 响应
+            # 用 list + join 累积增量，避免 O(n²) 的字符串拼接
+            parts: list[str] = []
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
 
-            # 清理可能的 markdown 代码块标记
-            if raw_content.startswith("```"):
-                lines = raw_content.split("\n")
-                # 移除首尾的 ``` 行
-                lines = [l for l in lines if not l.strip().startswith("```")]
-                raw_content = "\n".join(lines)
+            raw_content = "".join(parts).strip()
+            logger.debug(f"AI 原始返回: {raw_content}")
 
             parsed = json.loads(raw_content)
             subject = parsed.get("subject", "日常问候")
             body = parsed.get("body", "")
 
-            if subject_prefix:
-                subject = f"{subject_prefix}{subject}"
-
             if not body:
                 raise ValueError("AI 返回的邮件正文为空")
 
-            logger.info(f"邮件内容生成成功 | 主题: {subject}")
-            return EmailContent(subject=subject, body=body)
+            # 缓存不含前缀的原始内容，前缀在返回前按账号拼接
+            content = EmailContent(subject=subject, body=body)
+            self._cache_store(cache_key, content)
+            content = self._apply_prefix(content, subject_prefix)
+
+            logger.info(f"邮件内容生成成功 | 主题: {content.subject}")
+            return content
 
         except json.JSONDecodeError as e:
+            # JSON 模式下理论上不会发生，仅作兜底记录后抛出
             logger.error(f"AI 返回的 JSON 解析失败: {e}\n原始内容: {raw_content}")
-            # 降级处理：直接使用原始内容作为正文
-            return EmailContent(
-                subject=f"{subject_prefix}日常问候" if subject_prefix else "日常问候",
-                body=raw_content,
-            )
+            raise
         except Exception as e:
             logger.error(f"AI 内容生成失败: {e}")
             raise
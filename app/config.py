@@ -14,7 +14,7 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 # 常见英文名，用于自动生成发件人
-FIRST_NAMES = [
+FIRST_NAMES = (
     "James", "John", "Robert", "Michael", "David", "William", "Richard", "Joseph",
     "Thomas", "Charles", "Mary", "Patricia", "Jennifer", "Linda", "Barbara",
     "Elizabeth", "Susan", "Jessica", "Sarah", "Karen", "Emily", "Emma", "Olivia",
@@ -22,22 +22,26 @@ FIRST_NAMES = [
     "Andrew", "Paul", "Joshua", "Kenneth", "Kevin", "Brian", "George", "Timothy",
     "Ronald", "Edward", "Jason", "Jeffrey", "Ryan", "Jacob", "Nicholas",
     "Alice", "Grace", "Chloe", "Lily", "Hannah", "Mia", "Ella", "Charlotte",
-]
+)
 
-LAST_NAMES = [
+LAST_NAMES = (
     "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
     "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
     "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Thompson", "White",
     "Harris", "Clark", "Lewis", "Robinson", "Walker", "Young", "Allen",
     "King", "Wright", "Scott", "Torres", "Hill", "Adams", "Nelson", "Baker",
     "Carter", "Mitchell", "Roberts", "Turner", "Phillips", "Campbell", "Parker",
-]
+)
+
+
+# 独立的随机数生成器，不与全局实例共享状态
+_rng = random.Random()
 
 
 def _generate_name() -> tuple[str, str]:
     """生成一个随机英文人名，返回 (first_name, full_name)"""
-    first = random.choice(FIRST_NAMES)
-    last = random.choice(LAST_NAMES)
+    first = _rng.choice(FIRST_NAMES)
+    last = _rng.choice(LAST_NAMES)
     return first.lower(), f"{first} {last}"
 
 
@@ -77,6 +81,26 @@ class AccountConfig:
                 f"当前为 {len(parts)} 个字段: '{self.cron}'"
             )
 
+        # 校验的同时直接构建 CronTrigger，调度器注册时直接消费，避免二次解析
+        from apscheduler.triggers.cron import CronTrigger
+
+        try:
+            self.trigger = CronTrigger(
+                minute=parts[0],
+                hour=parts[1],
+                day=parts[2],
+                month=parts[3],
+                day_of_week=parts[4],
+            )
+        except ValueError as e:
+            raise ValueError(f"[{self.name}] cron 表达式无效: '{self.cron}' ({e})")
+
+        # 预计算派生字符串，避免每次定时任务触发时重复拼接
+        self.sender_header = (
+            f"{self.from_name} <{self.from_email}>" if self.from_name else self.from_email
+        )
+        self.log_tag = f"[{self.name}]"
+
 
 @dataclass
 class AppConfig:
@@ -89,6 +113,7 @@ class AppConfig:
     timezone: str = "Asia/Shanghai"  # 时区
     tg_bot_token: str = ""           # Telegram Bot Token（可选）
     tg_chat_id: str = ""             # Telegram Chat ID（可选）
+    ai_cache_reuse_prob: float = 0.3  # 同一 prompt 复用历史内容的概率（0~1，0 禁用复用）
 
     def __post_init__(self):
         if not self.resend_api_key:
@@ -97,6 +122,10 @@ class AppConfig:
             raise ValueError("缺少 AI_API_KEY 环境变量")
         if not self.accounts:
             raise ValueError("至少需要配置一个账号 (ACCOUNTS)")
+        if not 0 <= self.ai_cache_reuse_prob <= 1:
+            raise ValueError(
+                f"AI_CACHE_REUSE_PROB 必须在 0~1 之间，当前为: {self.ai_cache_reuse_prob}"
+            )
 
 
 def load_config() -> AppConfig:
@@ -110,6 +139,14 @@ def load_config() -> AppConfig:
     tg_bot_token = os.environ.get("TG_BOT_TOKEN", "")
     tg_chat_id = os.environ.get("TG_CHAT_ID", "")
 
+    ai_cache_reuse_prob_raw = os.environ.get("AI_CACHE_REUSE_PROB", "0.3")
+    try:
+        ai_cache_reuse_prob = float(ai_cache_reuse_prob_raw)
+    except ValueError:
+        raise ValueError(
+            f"AI_CACHE_REUSE_PROB 必须是 0~1 之间的数字，当前为: '{ai_cache_reuse_prob_raw}'"
+        )
+
     # 全局默认值
     default_email_domain = os.environ.get("DEFAULT_EMAIL_DOMAIN", "")
     default_from_name = os.environ.get("DEFAULT_FROM_NAME", "")  # 空则自动生成
@@ -167,6 +204,7 @@ def load_config() -> AppConfig:
         timezone=timezone,
         tg_bot_token=tg_bot_token,
         tg_chat_id=tg_chat_id,
+        ai_cache_reuse_prob=ai_cache_reuse_prob,
     )
 
     logger.info(f"配置加载成功，共 {len(accounts)} 个账号:")
@@ -4,16 +4,51 @@
 """
 
 import logging
-import resend
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+# HTML 包装的静态部分，避免每次发送都重建整个模板字符串
+_HTML_PREFIX = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body style="font-family: -apple-system, 'Segoe UI', sans-serif; font-size: 15px; line-height: 1.8; color: #333; padding: 20px;">
+"""
+_HTML_SUFFIX = """
+</body>
+</html>"""
+
 
 class EmailSender:
     """Resend 邮件发送器"""
 
+    # 正文 → HTML 缓存上限
+    HTML_CACHE_MAXSIZE = 32
+
     def __init__(self, api_key: str):
+        # 延迟导入：推迟到真正构造发送器时再加载 resend，加快冷启动
+        import resend
+
         resend.api_key = api_key
+        self._resend = resend
+        # AI 内容缓存可能返回重复正文，这里记住渲染结果避免重复构建 HTML
+        self._html_cache: OrderedDict[str, str] = OrderedDict()
+
+    def _render_html(self, body: str) -> str:
+        """将纯文本正文渲染为 HTML，重复正文直接走缓存"""
+        cached = self._html_cache.get(body)
+        if cached is not None:
+            self._html_cache.move_to_end(body)
+            return cached
+
+        # 保留换行等格式，无换行时跳过 replace
+        html_body = body.replace("\n", "<br>\n") if "\n" in body else body
+        html_content = _HTML_PREFIX + html_body + _HTML_SUFFIX
+
+        self._html_cache[body] = html_content
+        if len(self._html_cache) > self.HTML_CACHE_MAXSIZE:
+            self._html_cache.popitem(last=False)
+        return html_content
 
     def send(
         self,
@@ -22,6 +57,7 @@ class EmailSender:
         to_email: str,
         subject: str,
         body: str,
+        sender: str = "",
     ) -> dict:
         """
         发送邮件
@@ -32,23 +68,17 @@ class EmailSender:
             to_email: 收件人邮箱
             subject: 邮件主题
             body: 邮件正文（纯文本）
+            sender: 预计算的发件人头（可选，省去每次拼接）
 
         Returns:
             dict: Resend API 返回结果
         """
-        sender = f"{from_name} <{from_email}>" if from_name else from_email
+        if not sender:
+            sender = f"{from_name} <{from_email}>" if from_name else from_email
 
-        # 将纯文本正文转换为简单 HTML（保留换行等格式）
-        html_body = body.replace("\n", "<br>\n")
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head><meta charset="utf-8"></head>
-<body style="font-family: -apple-system, 'Segoe UI', sans-serif; font-size: 15px; line-height: 1.8; color: #333; padding: 20px;">
-{html_body}
-</body>
-</html>"""
+        html_content = self._render_html(body)
 
-        params: resend.Emails.SendParams = {
+        params = {
             "from": sender,
             "to": [to_email],
             "subject": subject,
@@ -58,7 +88,7 @@ class EmailSender:
         logger.info(f"正在发送邮件: {sender} → {to_email} | 主题: {subject}")
 
         try:
-            result = resend.Emails.send(params)
+            result = self._resend.Emails.send(params)
             logger.info(f"邮件发送成功 ✅ | ID: {result.get('id', 'N/A')}")
             return result
         except Exception as e:
@@ -3,46 +3,59 @@ Auto-Sendmail 入口
 使用 AI 生成拟人化邮件内容，通过 Resend API 定时发送
 """
 
+import asyncio
 import logging
 import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 
 from app.config import load_config
 from app.scheduler import create_scheduler
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
 logger = logging.getLogger(__name__)
 
+# .env 固定在项目根目录，显式指定路径省去 dotenv 的逐级向上查找
+_DOTENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+
+async def _run(config) -> None:
+    """在运行中的事件循环内启动调度器并常驻"""
+    scheduler = create_scheduler(config)
+    scheduler.start()
+
+    logger.info("")
+    logger.info("✅ 所有定时任务已注册，调度器运行中...")
+    logger.info("   按 Ctrl+C 停止")
+    logger.info("")
+
+    # 常驻等待，定时任务由调度器在本循环上触发
+    await asyncio.Event().wait()
+
 
 def main():
     """主函数"""
+    # 日志配置只在作为程序入口运行时生效，单纯 import 本模块不改动全局日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
     logger.info("=" * 60)
     logger.info("🚀 Auto-Sendmail 启动中...")
     logger.info("=" * 60)
 
     # 加载 .env 文件（Docker 环境中可能不存在，不报错）
-    load_dotenv(override=False)
+    load_dotenv(dotenv_path=_DOTENV_PATH, override=False)
 
     try:
         # 加载配置
         config = load_config()
 
-        # 创建并启动调度器
-        scheduler = create_scheduler(config)
-
-        logger.info("")
-        logger.info("✅ 所有定时任务已注册，调度器运行中...")
-        logger.info("   按 Ctrl+C 停止")
-        logger.info("")
-
-        scheduler.start()
+        # AsyncIOScheduler 必须在运行中的事件循环里启动，由 asyncio.run 驱动
+        asyncio.run(_run(config))
 
     except KeyboardInterrupt:
         logger.info("👋 收到停止信号，正在关闭...")
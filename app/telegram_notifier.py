@@ -3,8 +3,8 @@ Telegram 通知模块
 发送邮件结果通知到 Telegram
 """
 
+import asyncio
 import logging
-import requests
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,9 @@ class TelegramNotifier:
 
     API_URL = "https://api.telegram.org/bot{token}/sendMessage"
 
+    BATCH_WINDOW = 2.0      # 合并窗口（秒）：窗口内的通知合并为一条消息
+    MAX_MESSAGE_LEN = 4096  # Telegram 单条消息长度上限
+
     def __init__(self, bot_token: str, chat_id: str):
         self.bot_token = bot_token
         self.chat_id = chat_id
@@ -21,13 +24,46 @@ class TelegramNotifier:
 
         if not self.enabled:
             logger.warning("Telegram 通知未配置 (缺少 TG_BOT_TOKEN 或 TG_CHAT_ID)，将跳过通知")
+        else:
+            # 延迟导入：未配置通知时完全不加载 httpx
+            import httpx
+
+            # 复用长连接，避免每次通知都重新建立 TLS 连接；URL 只格式化一次
+            self._client = httpx.AsyncClient(timeout=10.0)
+            self._url = self.API_URL.format(token=bot_token)
+            # 通知先入队，由后台协程按窗口合并发送，多个账号撞点时 N 次调用合并为 1 次
+            self._queue: asyncio.Queue[str] = asyncio.Queue()
+            self._drain_task: asyncio.Task | None = None
+
+    def _enqueue(self, message: str):
+        """通知入队，并确保后台合并协程在运行（需要运行中的事件循环）"""
+        if not self.enabled:
+            return
+        self._queue.put_nowait(message)
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_loop())
+
+    async def _drain_loop(self):
+        """每个窗口期把积压的通知合并成尽量少的消息发送"""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.BATCH_WINDOW)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            combined = "\n\n".join(batch)
+            if len(combined) <= self.MAX_MESSAGE_LEN:
+                await self.send(combined)
+            else:
+                # 合并后超长则逐条发送（单条通知远小于上限）
+                for msg in batch:
+                    await self.send(msg)
 
-    def send(self, message: str):
+    async def send(self, message: str):
         """发送 Telegram 消息"""
         if not self.enabled:
             return
 
-        url = self.API_URL.format(token=self.bot_token)
         payload = {
             "chat_id": self.chat_id,
             "text": message,
@@ -35,13 +71,13 @@ class TelegramNotifier:
         }
 
         try:
-            resp = requests.post(url, json=payload, timeout=10)
+            resp = await self._client.post(self._url, json=payload)
             resp.raise_for_status()
             logger.debug("Telegram 通知发送成功")
         except Exception as e:
             logger.error(f"Telegram 通知发送失败: {e}")
 
-    def notify_success(self, account_name: str, to_email: str, subject: str):
+    async def notify_success(self, account_name: str, to_email: str, subject: str):
         """通知邮件发送成功"""
         msg = (
             f"✅ <b>邮件发送成功</b>\n"
@@ -49,9 +85,9 @@ class TelegramNotifier:
             f"📮 收件人: {to_email}\n"
             f"📝 主题: {subject}"
         )
-        self.send(msg)
+        self._enqueue(msg)
 
-    def notify_failure(self, account_name: str, to_email: str, error: str):
+    async def notify_failure(self, account_name: str, to_email: str, error: str):
         """通知邮件发送失败"""
         msg = (
             f"❌ <b>邮件发送失败</b>\n"
@@ -59,4 +95,4 @@ class TelegramNotifier:
             f"📮 收件人: {to_email}\n"
             f"⚠️ 错误: {error}"
         )
-        self.send(msg)
+        self._enqueue(msg)